@@ -1,26 +1,75 @@
 import pandas as pd
 import numpy as np
-import random
 import datetime as dt
-from faker import Faker
-import csv
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import importlib.util
+import pyarrow as pa
+import pyarrow.csv as pvc
 
-# Initialize Faker for realistic data
-fake = Faker()
-Faker.seed(42)  # For reproducible results
-random.seed(42)
-np.random.seed(42)
+# Single seed source for reproducible results
+seed_seq = np.random.SeedSequence(42)
+rng = np.random.default_rng(seed_seq)
 
-def generate_large_dataset(num_records=100000, filename="large_demo_dataset.csv"):
+@functools.cache
+def get_faker():
+    """Create the Faker instance on first use, seeded from the same sequence"""
+    from faker import Faker  # Deferred: Faker is slow to import
+    
+    fake = Faker()
+    fake.seed_instance(int(seed_seq.generate_state(1)[0]))
+    return fake
+
+def compute_numeric_columns(price_min, price_max, quantities, u_price, u_invalid, u_disc, u_disc_trigger):
+    """
+    Derive price, discount and total columns for a batch in whole-array operations
+    
+    Args:
+        price_min, price_max: Per-row price bounds for each record's category
+        quantities: Per-row order quantities
+        u_price, u_invalid, u_disc, u_disc_trigger: Pre-drawn uniforms in [0, 1)
+    
+    Returns:
+        Tuple of (prices, discounts, total_amounts) arrays
+    """
+    prices = np.round(price_min + u_price * (price_max - price_min), 2)
+    
+    # Some invalid prices for demo (2% of records)
+    prices = np.where(u_invalid < 0.02, -prices, prices)  # Negative price for validation demo
+    
+    # Discount logic - more discounts on higher quantities
+    discounts = np.round(np.select(
+        [quantities > 5, quantities > 3, u_disc_trigger < 0.3],
+        [10 + 15 * u_disc, 5 + 10 * u_disc, 10 * u_disc],
+        default=0.0
+    ), 1)
+    
+    # Calculate total amount
+    subtotals = np.abs(prices) * quantities  # Use abs for calculation even with invalid prices
+    total_amounts = np.round(subtotals - subtotals * (discounts / 100), 2)
+    
+    return prices, discounts, total_amounts
+
+def generate_large_dataset(num_records=100000, filename="large_demo_dataset.csv", seed=None, verbose=True):
     """
     Generate a large, realistic e-commerce dataset for demo purposes
     
     Args:
         num_records: Number of records to generate (default 100,000)
         filename: Output CSV filename
+        seed: Optional SeedSequence for an independent, reproducible stream
+              (defaults to the module-level generator)
+        verbose: Print per-batch progress; when False (e.g. in a worker process)
+                 only the summary is printed, as one framed block
     """
     
-    print(f"🚀 Generating {num_records:,} records...")
+    # Use an independent stream when a seed is given, e.g. in a worker process
+    gen = rng if seed is None else np.random.default_rng(seed)
+    fake = get_faker()
+    if seed is not None:
+        fake.seed_instance(int(gen.integers(2**32)))
+    
+    print(f"🚀 Generating {num_records:,} records for {filename}...")
     print("📊 This may take 2-3 minutes for 100K records...")
     
     # Sample data categories - expanded for variety
@@ -41,139 +90,165 @@ def generate_large_dataset(num_records=100000, filename="large_demo_dataset.csv"
     
     # Date range for the last 12 months
     start_date = dt.datetime.now() - dt.timedelta(days=365)
+    start_day = np.datetime64(start_date.date(), 'D')
     
     # Product names for variety
     product_prefixes = ['Premium', 'Standard', 'Deluxe', 'Pro', 'Basic', 'Ultra', 'Smart', 'Classic']
     product_types = ['Phone', 'Laptop', 'Shirt', 'Shoes', 'Book', 'Watch', 'Bag', 'Headset']
     
+    # Realistic pricing based on category
+    price_ranges = {
+        'Electronics': (50, 1500),
+        'Clothing': (20, 300),
+        'Home & Garden': (30, 800),
+        'Sports & Outdoors': (25, 500),
+        'Books & Media': (5, 100),
+        'Automotive': (100, 2000),
+        'Health & Beauty': (15, 200),
+        'Toys & Games': (10, 150),
+        'Food & Beverages': (5, 50),
+        'Office Supplies': (10, 300),
+        'Jewelry': (50, 1000),
+        'Pet Supplies': (15, 200)
+    }
+    
+    # Lookup arrays aligned with the indices drawn per batch; low-cardinality
+    # columns are written as dictionary-encoded codes over these values
+    price_min_arr = np.array([price_ranges.get(c, (10, 100))[0] for c in categories])
+    price_max_arr = np.array([price_ranges.get(c, (10, 100))[1] for c in categories])
+    categories_dict = pa.array(categories)
+    regions_dict = pa.array(regions)
+    statuses_dict = pa.array(statuses)
+    payment_methods_dict = pa.array(payment_methods)
+    product_prefixes_arr = np.array(product_prefixes)
+    product_types_arr = np.array(product_types)
+    
+    # Bind Faker providers once rather than resolving them for every row
+    fake_name = fake.name
+    fake_email = fake.email
+    fake_address = fake.address
+    fake_phone_number = fake.phone_number
+    single_line = str.maketrans({'\n': ', '})  # Flattens multi-line addresses
+    
     # Generate data in batches to manage memory
     batch_size = 10000
     total_batches = (num_records + batch_size - 1) // batch_size
     
-    # Open CSV file for writing
-    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-        # Define fieldnames
-        fieldnames = [
-            'order_id', 'customer_id', 'customer_name', 'customer_email', 
-            'product_name', 'category', 'price', 'quantity', 'discount_percent',
-            'total_amount', 'region', 'order_status', 'payment_method',
-            'order_date', 'shipping_address', 'phone_number'
-        ]
-        
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
+    # Column layout of the output file; numeric columns use the narrowest type that holds them
+    schema = pa.schema([
+        ('order_id', pa.string()),
+        ('customer_id', pa.string()),
+        ('customer_name', pa.string()),
+        ('customer_email', pa.string()),
+        ('product_name', pa.string()),
+        ('category', pa.dictionary(pa.int8(), pa.string())),
+        ('price', pa.float32()),
+        ('quantity', pa.int16()),
+        ('discount_percent', pa.float32()),
+        ('total_amount', pa.float32()),
+        ('region', pa.dictionary(pa.int8(), pa.string())),
+        ('order_status', pa.dictionary(pa.int8(), pa.string())),
+        ('payment_method', pa.dictionary(pa.int8(), pa.string())),
+        ('order_date', pa.date32()),
+        ('shipping_address', pa.string()),
+        ('phone_number', pa.string())
+    ])
+    
+    # Stream batches straight to CSV as Arrow tables through a 4 MiB write buffer,
+    # encoding each generated batch as a single block of rows
+    with pa.output_stream(filename, buffer_size=4 * 1024 * 1024) as sink, \
+            pvc.CSVWriter(sink, schema, write_options=pvc.WriteOptions(batch_size=batch_size)) as writer:
         # Generate data in batches
         for batch_num in range(total_batches):
-            print(f"⚡ Processing batch {batch_num + 1}/{total_batches}")
+            if verbose:
+                print(f"⚡ Processing batch {batch_num + 1}/{total_batches}")
+            
+            batch_start = batch_num * batch_size
+            batch_records = min(batch_size, num_records - batch_start)
+            
+            # Draw every numeric/categorical column for the batch in one call each
+            order_ids = np.char.add('ORD-', (10000 + batch_start + np.arange(batch_records)).astype(str))
+            customer_ids = np.char.add('CUST-', gen.integers(1000, 100000, batch_records).astype(str))
+            
+            product_names = (
+                pd.Series(product_prefixes_arr[gen.integers(0, len(product_prefixes), batch_records)])
+                + ' ' + product_types_arr[gen.integers(0, len(product_types), batch_records)]
+                + ' ' + gen.integers(100, 1000, batch_records).astype(str)
+            )
+            
+            cat_idx = gen.integers(0, len(categories), batch_records).astype(np.int8)  # Drawn as int64 to keep the seeded stream
+            quantities = gen.integers(1, 9, batch_records).astype(np.int16)  # Drawn as int64 to keep the seeded stream
             
-            batch_records = min(batch_size, num_records - (batch_num * batch_size))
-            batch_data = []
+            # Numeric columns come from one kernel fed with pre-drawn uniforms
+            prices, discounts, total_amounts = compute_numeric_columns(
+                price_min_arr[cat_idx],
+                price_max_arr[cat_idx],
+                quantities,
+                gen.random(batch_records),
+                gen.random(batch_records),
+                gen.random(batch_records),
+                gen.random(batch_records)
+            )
             
-            for i in range(batch_records):
-                record_id = (batch_num * batch_size) + i
-                
-                # Generate realistic customer data
-                customer_id = f'CUST-{random.randint(1000, 99999)}'
-                customer_name = fake.name()
-                
-                # 5% invalid emails for demo purposes
-                if random.random() < 0.05:
-                    customer_email = f"invalid-email-{record_id}"
-                else:
-                    customer_email = fake.email()
-                
-                # Generate product information
-                product_prefix = random.choice(product_prefixes)
-                product_type = random.choice(product_types)
-                product_name = f"{product_prefix} {product_type} {random.randint(100, 999)}"
-                
-                category = random.choice(categories)
-                
-                # Realistic pricing based on category
-                price_ranges = {
-                    'Electronics': (50, 1500),
-                    'Clothing': (20, 300),
-                    'Home & Garden': (30, 800),
-                    'Sports & Outdoors': (25, 500),
-                    'Books & Media': (5, 100),
-                    'Automotive': (100, 2000),
-                    'Health & Beauty': (15, 200),
-                    'Toys & Games': (10, 150),
-                    'Food & Beverages': (5, 50),
-                    'Office Supplies': (10, 300),
-                    'Jewelry': (50, 1000),
-                    'Pet Supplies': (15, 200)
-                }
-                
-                price_min, price_max = price_ranges.get(category, (10, 100))
-                price = round(random.uniform(price_min, price_max), 2)
-                
-                # Some invalid prices for demo (2% of records)
-                if random.random() < 0.02:
-                    price = -abs(price)  # Negative price for validation demo
-                
-                quantity = random.randint(1, 8)
-                
-                # Discount logic - more discounts on higher quantities
-                if quantity > 5:
-                    discount_percent = round(random.uniform(10, 25), 1)
-                elif quantity > 3:
-                    discount_percent = round(random.uniform(5, 15), 1)
-                else:
-                    discount_percent = round(random.uniform(0, 10), 1) if random.random() < 0.3 else 0
-                
-                # Calculate total amount
-                subtotal = abs(price) * quantity  # Use abs for calculation even with invalid prices
-                discount_amount = subtotal * (discount_percent / 100)
-                total_amount = round(subtotal - discount_amount, 2)
-                
-                # Random date within the last year
-                random_days = random.randint(0, 365)
-                order_date = start_date + dt.timedelta(days=random_days)
-                
-                # Other fields
-                region = random.choice(regions)
-                order_status = random.choice(statuses)
-                payment_method = random.choice(payment_methods)
-                shipping_address = fake.address()
-                phone_number = fake.phone_number()
-                
-                record = {
-                    'order_id': f'ORD-{10000 + record_id}',
-                    'customer_id': customer_id,
-                    'customer_name': customer_name,
-                    'customer_email': customer_email,
-                    'product_name': product_name,
-                    'category': category,
-                    'price': price,
-                    'quantity': quantity,
-                    'discount_percent': discount_percent,
-                    'total_amount': total_amount,
-                    'region': region,
-                    'order_status': order_status,
-                    'payment_method': payment_method,
-                    'order_date': order_date.strftime('%Y-%m-%d'),
-                    'shipping_address': shipping_address.replace('\n', ', '),
-                    'phone_number': phone_number
-                }
-                
-                batch_data.append(record)
+            # Random date within the last year
+            # Day offsets on datetime64[D]; Arrow writes date32 as YYYY-MM-DD itself
+            order_dates = start_day + gen.integers(0, 366, batch_records)
+            
+            # Faker fields are filled a whole batch at a time from bound provider methods
+            customer_names = [fake_name() for _ in range(batch_records)]
+            shipping_addresses = [fake_address().translate(single_line) for _ in range(batch_records)]
+            phone_numbers = [fake_phone_number() for _ in range(batch_records)]
+            
+            # 5% invalid emails for demo purposes
+            invalid_email = gen.random(batch_records) < 0.05
+            customer_emails = np.where(
+                invalid_email,
+                np.char.add('invalid-email-', (batch_start + np.arange(batch_records)).astype(str)),
+                [fake_email() for _ in range(batch_records)]
+            )
+            
+            batch_table = pa.table({
+                'order_id': order_ids,
+                'customer_id': customer_ids,
+                'customer_name': customer_names,
+                'customer_email': customer_emails,
+                'product_name': product_names,
+                'category': pa.DictionaryArray.from_arrays(cat_idx, categories_dict),
+                'price': prices,
+                'quantity': quantities,
+                'discount_percent': discounts,
+                'total_amount': total_amounts,
+                'region': pa.DictionaryArray.from_arrays(
+                    gen.integers(0, len(regions), batch_records).astype(np.int8), regions_dict),
+                'order_status': pa.DictionaryArray.from_arrays(
+                    gen.integers(0, len(statuses), batch_records).astype(np.int8), statuses_dict),
+                'payment_method': pa.DictionaryArray.from_arrays(
+                    gen.integers(0, len(payment_methods), batch_records).astype(np.int8), payment_methods_dict),
+                'order_date': order_dates,
+                'shipping_address': shipping_addresses,
+                'phone_number': phone_numbers
+            }, schema=schema)
             
             # Write batch to CSV
-            writer.writerows(batch_data)
-    
-    print(f"✅ Successfully generated {num_records:,} records")
-    print(f"📁 Saved to: {filename}")
-    print(f"📊 File size: ~{num_records * 0.0003:.1f} MB")
+            writer.write_table(batch_table)
     
     # Generate summary statistics
-    df_sample = pd.DataFrame(batch_data[-1000:])  # Last 1000 records for quick stats
-    print("\n📈 Sample Data Summary:")
-    print(f"• Categories: {df_sample['category'].nunique()}")
-    print(f"• Regions: {df_sample['region'].nunique()}")
-    print(f"• Date range: {df_sample['order_date'].min()} to {df_sample['order_date'].max()}")
-    print(f"• Price range: ₦{df_sample['price'].min():.2f} to ₦{df_sample['price'].max():.2f}")
+    df_sample = batch_table.slice(max(batch_table.num_rows - 1000, 0)).to_pandas()  # Last 1000 records for quick stats
+    report = [
+        f"✅ Successfully generated {num_records:,} records",
+        f"📁 Saved to: {filename}",
+        f"📊 File size: ~{num_records * 0.0003:.1f} MB",
+        f"\n📈 Sample Data Summary ({filename}):",
+        f"• Categories: {df_sample['category'].nunique()}",
+        f"• Regions: {df_sample['region'].nunique()}",
+        f"• Date range: {df_sample['order_date'].min()} to {df_sample['order_date'].max()}",
+        f"• Price range: ₦{df_sample['price'].min():.2f} to ₦{df_sample['price'].max():.2f}"
+    ]
+    if not verbose:
+        report = [f"\n{'='*50}", *report, f"{'='*50}"]
+    
+    # One write per report so blocks from concurrent workers stay whole
+    print("\n".join(report), flush=True)
     
     return filename
 
@@ -187,16 +262,20 @@ def generate_smaller_datasets():
         (100000, "demo_100k_records.csv")
     ]
     
-    for size, filename in datasets:
-        print(f"\n{'='*50}")
-        generate_large_dataset(size, filename)
-        print(f"{'='*50}")
+    # Sizes are independent, so generate them concurrently; each worker gets
+    # its own child seed so the files stay reproducible without overlapping,
+    # and runs quietly so per-batch progress doesn't interleave across workers
+    sizes, filenames = zip(*datasets)
+    seeds = seed_seq.spawn(len(datasets))
+    generate_quietly = functools.partial(generate_large_dataset, verbose=False)
+    
+    with ProcessPoolExecutor(max_workers=len(datasets)) as executor:
+        for filename in executor.map(generate_quietly, sizes, filenames, seeds):
+            print(f"📁 Finished: {filename}")
 
 if __name__ == "__main__":
     # Install required package first
-    try:
-        from faker import Faker
-    except ImportError:
+    if importlib.util.find_spec('faker') is None:
         print("❌ Faker package required. Install with: pip install faker")
         exit(1)
     
@@ -1,13 +1,11 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import time
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pvc
 import datetime as dt
 from io import StringIO
-import random
 
 # Page configuration
 st.set_page_config(
@@ -43,9 +41,11 @@ st.markdown("""
 class ETLPipeline:
     """Main ETL Pipeline Class"""
     
-    def __init__(self):
+    def __init__(self, seed=42):
+        self.seed = seed
         self.raw_data = None
         self.processed_data = None
+        self.customer_groups = None
         self.data_quality_report = {}
         self.processing_logs = []
         
@@ -59,6 +59,15 @@ class ETLPipeline:
     def generate_sample_data(self, num_records=1000):
         """Generate realistic e-commerce sample data"""
         self.log(f"🎲 Generating {num_records} sample records...")
+        self.raw_data = self._build_sample_data(num_records, self.seed, dt.date.today())
+        self.log(f"✅ Successfully generated {len(self.raw_data)} records")
+        return self.raw_data
+    
+    @staticmethod
+    @st.cache_data(show_spinner=False)
+    def _build_sample_data(num_records, seed, today):
+        """Build the sample frame; memoized on (num_records, seed, today) across reruns"""
+        rng = np.random.default_rng(seed)
         
         # Sample data categories
         categories = ['Electronics', 'Clothing', 'Home & Garden', 'Sports', 'Books', 'Automotive']
@@ -66,53 +75,108 @@ class ETLPipeline:
         statuses = ['Completed', 'Pending', 'Cancelled', 'Returned']
         
         # Date range for the last 6 months
-        start_date = dt.datetime.now() - dt.timedelta(days=180)
+        start_date = today - dt.timedelta(days=180)
+        
+        # Draw every column as a whole array; categoricals are built straight from codes
+        idx = np.arange(num_records)
+        start_day = np.datetime64(start_date, 'D')
+        prices = np.round(rng.uniform(5.0, 999.99, num_records), 2)
+        quantities = rng.integers(1, 11, num_records)
+        discounts = np.where(
+            rng.random(num_records) < 0.3,
+            np.round(rng.uniform(0, 30, num_records), 1),
+            0
+        )
         
-        data = []
-        for i in range(num_records):
-            # Random date within the last 6 months
-            random_days = random.randint(0, 180)
-            sale_date = start_date + dt.timedelta(days=random_days)
-            
-            # Generate record
-            record = {
-                'order_id': f'ORD-{1000 + i}',
-                'customer_id': f'CUST-{random.randint(1, 500)}',
-                'product_name': f'Product {chr(65 + i % 26)}{i % 100:02d}',
-                'category': random.choice(categories),
-                'price': round(random.uniform(5.0, 999.99), 2),
-                'quantity': random.randint(1, 10),
-                'region': random.choice(regions),
-                'order_status': random.choice(statuses),
-                'order_date': sale_date.strftime('%Y-%m-%d'),
-                'customer_email': self._generate_email(i),
-                'discount_percent': round(random.uniform(0, 30), 1) if random.random() < 0.3 else 0
-            }
-            
-            # Calculate total amount
-            subtotal = record['price'] * record['quantity']
-            discount_amount = subtotal * (record['discount_percent'] / 100)
-            record['total_amount'] = round(subtotal - discount_amount, 2)
-            
-            data.append(record)
+        # Calculate total amount
+        subtotals = prices * quantities
+        total_amounts = np.round(subtotals - subtotals * (discounts / 100), 2)
         
-        self.raw_data = pd.DataFrame(data)
-        self.log(f"✅ Successfully generated {len(self.raw_data)} records")
-        return self.raw_data
+        letters = np.array([chr(65 + k) for k in range(26)])
+        product_names = np.char.add(
+            np.char.add('Product ', letters[idx % 26]),
+            np.char.zfill((idx % 100).astype(str), 2)
+        )
+        
+        return pd.DataFrame({
+            'order_id': np.char.add('ORD-', (1000 + idx).astype(str)),
+            'customer_id': np.char.add('CUST-', rng.integers(1, 501, num_records).astype(str)),
+            'product_name': product_names,
+            'category': pd.Categorical.from_codes(
+                rng.integers(0, len(categories), num_records), categories),
+            'price': prices,
+            'quantity': quantities,
+            'region': pd.Categorical.from_codes(
+                rng.integers(0, len(regions), num_records), regions),
+            'order_status': pd.Categorical.from_codes(
+                rng.integers(0, len(statuses), num_records), statuses),
+            'order_date': (start_day + rng.integers(0, 181, num_records)).astype('datetime64[ns]'),
+            'customer_email': ETLPipeline._generate_emails(rng, num_records),
+            'discount_percent': discounts,
+            'total_amount': total_amounts
+        })
     
-    def _generate_email(self, index):
+    @staticmethod
+    def _generate_emails(rng, num_records):
         """Generate email addresses with some invalid ones for demo"""
-        if random.random() < 0.05:  # 5% invalid emails
-            return f"invalid-email-{index}"
-        
-        domains = ['gmail.com', 'yahoo.com', 'outlook.com', 'company.com']
-        return f"customer{index}@{random.choice(domains)}"
+        domains = np.array(['gmail.com', 'yahoo.com', 'outlook.com', 'company.com'])
+        invalid = rng.random(num_records) < 0.05  # 5% invalid emails
+        domain_picks = domains[rng.integers(0, len(domains), num_records)]
+        ids = np.arange(num_records).astype(str)
+        
+        return np.where(
+            invalid,
+            np.char.add('invalid-email-', ids),
+            np.char.add(np.char.add('customer', ids), np.char.add('@', domain_picks))
+        )
+    
+    @staticmethod
+    def _coerce_types(df):
+        """Coerce date and numeric columns once at ingest, skipping columns already typed"""
+        if df['order_date'].dtype != 'datetime64[ns]':
+            df['order_date'] = pd.to_datetime(df['order_date'], errors='coerce').astype('datetime64[ns]')
+        for col in ('price', 'quantity', 'total_amount'):
+            if not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+        return df
+    
+    @staticmethod
+    def _downcast_numeric(df):
+        """Cast numeric columns to float32/int16 when every value fits the narrower type"""
+        narrow_types = {
+            'price': 'float32',
+            'discount_percent': 'float32',
+            'quantity': 'int16',
+            'days_since_order': 'int16'
+        }
+        for col, dtype in narrow_types.items():
+            if col not in df.columns or not pd.api.types.is_numeric_dtype(df[col]):
+                continue
+            values = df[col]
+            if dtype == 'int16':
+                limits = np.iinfo(np.int16)
+                if values.isna().any() or values.min() < limits.min or values.max() > limits.max:
+                    continue
+            elif values.abs().max() > np.finfo(np.float32).max:
+                continue
+            df[col] = values.astype(dtype)
+    
+    @staticmethod
+    @st.cache_data(show_spinner=False)
+    def _read_csv(data):
+        """Parse CSV bytes into an Arrow-backed frame; memoized on the file contents"""
+        table = pvc.read_csv(
+            pa.BufferReader(data),
+            read_options=pvc.ReadOptions(block_size=8 << 20),
+            convert_options=pvc.ConvertOptions(strings_can_be_null=True)  # Blank cells as nulls, like pd.read_csv
+        )
+        return ETLPipeline._coerce_types(table.to_pandas(types_mapper=pd.ArrowDtype))
     
     def extract_data(self, uploaded_file=None):
         """Extract data from uploaded file or use sample data"""
         if uploaded_file is not None:
             try:
-                self.raw_data = pd.read_csv(uploaded_file)
+                self.raw_data = self._read_csv(uploaded_file.getvalue())
                 self.log(f"📁 Loaded {len(self.raw_data)} records from uploaded file")
                 return self.raw_data
             except Exception as e:
@@ -128,7 +192,7 @@ class ETLPipeline:
             return None
         
         self.log("🔧 Starting data transformation...")
-        df = self.raw_data.copy()
+        df = self.raw_data.copy(deep=False)  # Shares raw column buffers; derived columns land only here
         
         # Initialize quality tracking
         total_records = len(df)
@@ -136,61 +200,88 @@ class ETLPipeline:
         
         # 1. Data Type Conversions
         self.log("📊 Converting data types...")
-        df['order_date'] = pd.to_datetime(df['order_date'], errors='coerce')
-        df['price'] = pd.to_numeric(df['price'], errors='coerce')
-        df['quantity'] = pd.to_numeric(df['quantity'], errors='coerce')
-        df['total_amount'] = pd.to_numeric(df['total_amount'], errors='coerce')
+        for col in ('category', 'region', 'order_status', 'payment_method'):
+            if col in df.columns:
+                df[col] = df[col].astype('category')
         
         # 2. Data Validation
         self.log("✅ Validating data quality...")
         
         # Email validation
-        email_mask = df['customer_email'].str.contains('@', na=False)
-        invalid_emails = (~email_mask).sum()
+        email_valid = pc.fill_null(
+            pc.match_substring(pa.array(df['customer_email'], type=pa.string()), '@'), False
+        ).to_numpy(zero_copy_only=False)
+        invalid_email = ~email_valid
+        invalid_emails = invalid_email.sum()
         if invalid_emails > 0:
             quality_issues.append(f"Invalid emails: {invalid_emails}")
-            df.loc[~email_mask, 'data_quality_flag'] = 'Invalid Email'
         
         # Price validation
-        invalid_prices = (df['price'] <= 0).sum()
+        invalid_price = (df['price'] <= 0).to_numpy(dtype=bool, na_value=False)
+        invalid_prices = invalid_price.sum()
         if invalid_prices > 0:
             quality_issues.append(f"Invalid prices: {invalid_prices}")
-            df.loc[df['price'] <= 0, 'data_quality_flag'] = 'Invalid Price'
         
         # Quantity validation
-        invalid_quantities = (df['quantity'] <= 0).sum()
+        invalid_quantity = (df['quantity'] <= 0).to_numpy(dtype=bool, na_value=False)
+        invalid_quantities = invalid_quantity.sum()
         if invalid_quantities > 0:
             quality_issues.append(f"Invalid quantities: {invalid_quantities}")
-            df.loc[df['quantity'] <= 0, 'data_quality_flag'] = 'Invalid Quantity'
+        
+        # Flag each record once; quantity issues outrank price, price outranks email
+        df['data_quality_flag'] = np.select(
+            [invalid_quantity, invalid_price, invalid_email],
+            ['Invalid Quantity', 'Invalid Price', 'Invalid Email'],
+            default=None
+        )
+        is_clean = np.logical_and.reduce([email_valid, ~invalid_price, ~invalid_quantity])
         
         # 3. Business Logic Application
         self.log("💼 Applying business rules...")
         
         # Create price tiers
-        df['price_tier'] = pd.cut(df['price'], 
+        df['price_tier'] = pd.cut(df['price'].to_numpy(dtype=float, na_value=np.nan), 
                                  bins=[0, 50, 200, 500, float('inf')],
                                  labels=['Budget', 'Mid-range', 'Premium', 'Luxury'])
         
         # Calculate revenue metrics
         df['revenue'] = df['total_amount']
-        df['month'] = df['order_date'].dt.to_period('M')
-        df['quarter'] = df['order_date'].dt.to_period('Q')
+        # Integer period keys (months/quarters since year 0) group and sort as plain ints
+        order_years = df['order_date'].dt.year
+        order_months = df['order_date'].dt.month
+        df['month_key'] = order_years * 12 + (order_months - 1)
+        df['quarter_key'] = order_years * 4 + (order_months - 1) // 3
         
         # Customer segmentation
-        customer_totals = df.groupby('customer_id')['total_amount'].sum()
-        df['customer_segment'] = df['customer_id'].map(
-            lambda x: 'VIP' if customer_totals.get(x, 0) > 1000 
-            else 'Regular' if customer_totals.get(x, 0) > 300 
-            else 'New'
+        self.customer_groups = df.groupby('customer_id', sort=False, observed=True)
+        df['customer_total'] = self.customer_groups['total_amount'].transform('sum')
+        # Rows without a customer_id have no group total; they fall through to 'New'
+        df['customer_segment'] = np.select(
+            [(df['customer_total'] > 1000).to_numpy(dtype=bool, na_value=False),
+             (df['customer_total'] > 300).to_numpy(dtype=bool, na_value=False)],
+            ['VIP', 'Regular'],
+            default='New'
         )
         
         # 4. Data Enrichment
         self.log("🔍 Enriching data with derived metrics...")
-        df['days_since_order'] = (pd.Timestamp.now() - df['order_date']).dt.days
-        df['is_weekend_order'] = df['order_date'].dt.weekday >= 5
+        # Day numbers straight from the datetime64[ns] values; 1970-01-01 was a Thursday
+        day_ns = 86_400_000_000_000
+        order_ns = df['order_date'].to_numpy().view('i8')
+        order_days = order_ns // day_ns
+        missing_date = df['order_date'].isna().to_numpy()
+        # Whole days elapsed from the nanosecond gap, as Timedelta.days would give
+        days_since_order = (pd.Timestamp.now().value - order_ns) // day_ns
+        if missing_date.any():
+            days_since_order = np.where(missing_date, np.nan, days_since_order)
+        df['days_since_order'] = days_since_order
+        df['is_weekend_order'] = ~missing_date & ((order_days + 3) % 7 >= 5)
+        
+        # Narrow small-range numeric columns to halve their memory footprint
+        self._downcast_numeric(df)
         
         # 5. Data Quality Summary
-        clean_records = len(df[~df.get('data_quality_flag', pd.Series()).notna()])
+        clean_records = int(is_clean.sum())
         error_records = total_records - clean_records
         
         self.data_quality_report = {
@@ -221,18 +312,24 @@ class ETLPipeline:
             'total_revenue': df['revenue'].sum(),
             'avg_order_value': df['revenue'].mean(),
             'total_orders': len(df),
-            'unique_customers': df['customer_id'].nunique(),
-            'top_category': df.groupby('category')['revenue'].sum().idxmax(),
-            'best_region': df.groupby('region')['revenue'].sum().idxmax(),
+            'unique_customers': self.customer_groups.ngroups,
+            'top_category': df.groupby('category', observed=True)['revenue'].sum().idxmax(),
+            'best_region': df.groupby('region', observed=True)['revenue'].sum().idxmax(),
             'monthly_growth': self._calculate_monthly_growth(df)
         }
         
         self.log("✅ Analysis complete - insights generated")
         return insights
     
+    @staticmethod
+    def month_labels(month_keys):
+        """Format integer month keys as YYYY-MM labels for display"""
+        month_keys = month_keys.astype(int)
+        return (month_keys // 12).astype(str) + '-' + (month_keys % 12 + 1).astype(str).str.zfill(2)
+    
     def _calculate_monthly_growth(self, df):
         """Calculate month-over-month growth rate"""
-        monthly_revenue = df.groupby('month')['revenue'].sum().sort_index()
+        monthly_revenue = df.groupby('month_key')['revenue'].sum().sort_index()
         if len(monthly_revenue) >= 2:
             current_month = monthly_revenue.iloc[-1]
             previous_month = monthly_revenue.iloc[-2]
@@ -283,13 +380,11 @@ def main():
     
     if st.sidebar.button("🔧 Transform Data", disabled=pipeline.raw_data is None):
         with st.spinner("Transforming data..."):
-            time.sleep(1)  # Simulate processing time
             pipeline.transform_data()
             st.sidebar.success("Data transformation complete!")
     
     if st.sidebar.button("📊 Load & Analyze", disabled=pipeline.processed_data is None):
         with st.spinner("Loading and analyzing data..."):
-            time.sleep(1)  # Simulate processing time
             pipeline.load_and_analyze()
             st.sidebar.success("Analysis complete!")
     
@@ -344,6 +439,10 @@ def main():
     
     # Analytics Dashboard
     if pipeline.processed_data is not None:
+        # Plotly is only needed once there is something to chart
+        import plotly.express as px
+        import plotly.graph_objects as go
+        
         st.markdown("---")
         st.header("📊 Analytics Dashboard")
         
@@ -359,14 +458,14 @@ def main():
         with metric_col3:
             st.metric("Avg Order Value", f"${df['revenue'].mean():.2f}")
         with metric_col4:
-            st.metric("Unique Customers", f"{df['customer_id'].nunique():,}")
+            st.metric("Unique Customers", f"{pipeline.customer_groups.ngroups:,}")
         
         # Charts Row
         chart_col1, chart_col2 = st.columns(2)
         
         with chart_col1:
             # Revenue by Category
-            category_revenue = df.groupby('category')['revenue'].sum().reset_index()
+            category_revenue = df.groupby('category', observed=True)['revenue'].sum().reset_index()
             fig_category = px.pie(
                 category_revenue, 
                 values='revenue', 
@@ -377,8 +476,8 @@ def main():
         
         with chart_col2:
             # Monthly Revenue Trend
-            monthly_data = df.groupby(df['order_date'].dt.to_period('M'))['revenue'].sum().reset_index()
-            monthly_data['order_date'] = monthly_data['order_date'].astype(str)
+            monthly_data = df.groupby('month_key')['revenue'].sum().reset_index()
+            monthly_data['order_date'] = ETLPipeline.month_labels(monthly_data['month_key'])
             
             fig_trend = px.line(
                 monthly_data, 
@@ -390,7 +489,7 @@ def main():
         
         # Regional Analysis
         st.subheader("🗺️ Regional Performance")
-        region_metrics = df.groupby('region').agg({
+        region_metrics = df.groupby('region', observed=True).agg({
             'revenue': 'sum',
             'order_id': 'count',
             'customer_id': 'nunique'